@@ -17,6 +17,7 @@ LEAP CommandType:
     Lower
     Stop
 24/5/2022 V 1.0.0 N Waterton - Initial Release
+14/10/2026 V 1.0.1 Added -S/--suppress option for pico short press
 '''
 
 import logging
@@ -24,27 +25,51 @@ from logging.handlers import RotatingFileHandler
 import sys, argparse, os
 from datetime import timedelta
 from inspect import signature
+from pathlib import Path
 import asyncio
 
 from pylutron_caseta.smartbridge import Smartbridge, _LEAP_DEVICE_TYPES
 
 from mqtt import MQTT
 
-__version__ = __VERSION__ = '1.0.0'
+__version__ = __VERSION__ = '1.0.1'
+
+_INFO = logging.INFO
+
+#button names by button number, indexed by Pico type
+_PICO_BUTTONS = {"Pico1Button":           ("Button",),
+                 "Pico2Button":           ("On", "Off"),
+                 "Pico2ButtonRaiseLower": ("On", "Off", "Raise", "Lower"),
+                 "Pico3Button":           ("On", "Fav", "Off"),
+                 "Pico3ButtonRaiseLower": ("On", "Fav", "Off", "Raise", "Lower"),
+                 "Pico4Button":           ("1", "2", "3", "4"),
+                 "Pico4ButtonScene":      ("On", "Off", "Preset 1", "Preset 2"),
+                 "Pico4Button2Group":     ("Group 1 On", "Group 1 Off 2", "Group 2 On", "Group 2 Off"),
+                 "FourGroupRemote":       ("Group 1 On", "Group 2 On 2", "Group 3 On", "Group 4 On")
+                }
 
 class Device():
     '''
     Generic Device Class
+    fixed device attributes are copied out of the bridge device dict once, in __init__
     '''
+    __slots__ = ('log', 'device', 'parent', 'loop', '_name', '_device_id', '_type', '_model', '_serial', '_zone')
 
-    def __init__(self, device, parent=None):
+    def __init__(self, device, parent=None, loop=None):
         self.log = logging.getLogger('Main.'+__class__.__name__)
         self.device = device
         self.parent = parent
-        self.loop = asyncio.get_event_loop()
+        self.loop = loop if loop is not None else asyncio.get_event_loop()
+        self._name = device['name']
+        self._device_id = device['device_id']
+        self._type = device['type']
+        self._model = device.get('model')
+        self._serial = device.get('serial')
+        self._zone = device.get('zone')
         
     def __call__(self):
-        self.log.info('{}: {}, ID: {} value: {}'.format(self.type, self.name, self.device_id, self.current_state))
+        if self.log.isEnabledFor(_INFO):
+            self.log.info('%s: %s, ID: %s value: %s', self.type, self.name, self.device_id, self.current_state)
         self.publish(self.name, self.current_state)
         
     def __bool__(self):
@@ -57,27 +82,27 @@ class Device():
             
     @property
     def name(self):
-        return self.device['name']
+        return self._name
         
     @property
     def device_id(self):
-        return self.device['device_id']
+        return self._device_id
         
     @property
     def type(self):
-        return self.device['type']
+        return self._type
         
     @property
     def model(self):
-        return self.device['model']
+        return self._model
         
     @property
     def serial(self):
-        return self.device['serial']
+        return self._serial
         
     @property
     def zone(self):
-        return self.device['zone']
+        return self._zone
         
     @property
     def occupancy_sensors(self):
@@ -95,27 +120,30 @@ class LightDimmer(Device):
     '''
     Dimmer callback class
     '''
+    __slots__ = ()
 
-    def __init__(self, device, parent=None):
-        super().__init__(device, parent)
+    def __init__(self, device, parent=None, loop=None):
+        super().__init__(device, parent, loop)
         self.log = logging.getLogger('Main.'+__class__.__name__)
 
 class LightSwitch(Device):
     '''
     Switch callback class
     '''
+    __slots__ = ()
 
-    def __init__(self, device, parent=None):
-        super().__init__(device, parent)
+    def __init__(self, device, parent=None, loop=None):
+        super().__init__(device, parent, loop)
         self.log = logging.getLogger('Main.'+__class__.__name__)
         
 class Fan(Device):
     '''
     Switch callback class
     '''
+    __slots__ = ()
 
-    def __init__(self, device, parent=None):
-        super().__init__(device, parent)
+    def __init__(self, device, parent=None, loop=None):
+        super().__init__(device, parent, loop)
         self.log = logging.getLogger('Main.'+__class__.__name__)
         
     @property
@@ -126,9 +154,10 @@ class Blind(Device):
     '''
     Switch callback class
     '''
+    __slots__ = ()
 
-    def __init__(self, device, parent=None):
-        super().__init__(device, parent)
+    def __init__(self, device, parent=None, loop=None):
+        super().__init__(device, parent, loop)
         self.log = logging.getLogger('Main.'+__class__.__name__)
         
     @property
@@ -139,52 +168,70 @@ class PicoButton(Device):
     '''
     Pico Devices callback and utility class
     '''
+    __slots__ = ('suppress', 'double_click_time', 'long_press_time', 'start', '_events', '_event_task',
+                 '_button_number', '_button_groups', '_button_name', '_button_name_upper',
+                 '_topic_btn', '_topic_double', '_topic_long', '_topic_short')
     
-    picobuttons = {"Pico1Button":           {0:"Button"},
-                   "Pico2Button":           {0:"On", 1:"Off"},
-                   "Pico2ButtonRaiseLower": {0:"On", 1:"Off", 2:"Raise", 3:"Lower"},
-                   "Pico3Button":           {0:"On", 1:"Fav", 2:"Off"},
-                   "Pico3ButtonRaiseLower": {0:"On", 1:"Fav", 2:"Off", 3:"Raise", 4:"Lower"},
-                   "Pico4Button":           {0:"1", 1:"2", 2:"3", 3:"4"},
-                   "Pico4ButtonScene":      {0:"On", 1:"Off", 2:"Preset 1", 3:"Preset 2"},
-                   "Pico4Button2Group":     {0:"Group 1 On", 1:"Group 1 Off 2", 2:"Group 2 On", 3:"Group 2 Off"},
-                   "FourGroupRemote":       {0:"Group 1 On", 1:"Group 2 On 2", 2:"Group 3 On", 3:"Group 4 On"}
-                  }
+    picobuttons = _PICO_BUTTONS
     
-    def __init__(self, device, parent=None):
-        super().__init__(device, parent)
+    def __init__(self, device, parent=None, loop=None, suppress=False):
+        super().__init__(device, parent, loop)
         self.log = logging.getLogger('Main.'+__class__.__name__)
+        self._button_number = device['button_number']
+        self._button_groups = device.get('button_groups')
+        self._topic_btn = '{}/{}'.format(self._name, self._button_number)
+        self._topic_double = self._topic_btn + '/double'
+        self._topic_long = self._topic_btn + '/long'
+        self._topic_short = self._topic_btn + '/short'
+        self.suppress = suppress        #only publish short press if no double click or long press
         self.double_click_time = 0.5    #not long enough to capture Raise and Lower double click
         self.long_press_time = 1
         self.start = self.loop.time()
-        self._long_press_task = None
-        if self.type not in self.picobuttons.keys():
-            self.log.warning('Adding button type: {}'.format(self.type))
-            self.picobuttons[self.type] = {}
+        self._events = asyncio.Queue(maxsize=4)
+        self._event_task = self.loop.create_task(self._event_loop())
+        names = self.picobuttons.get(self._type)
+        if names is None:
+            self.log.warning('Adding button type: %s', self._type)
+            names = self.picobuttons[self._type] = ()
+        bn = self._button_number
+        self._button_name = names[bn] if 0 <= bn < len(names) else str(bn)
+        self._button_name_upper = self._button_name.upper()
             
     def __call__(self, msg=None):
+        dev = self.device
+        if msg is not None and dev.get('current_state') != msg:
+            dev['current_state'] = msg
+        state = 'ON' if dev.get('current_state') == 'Press' else 'OFF'
+        name = self._name
+        bn = self._button_number
+        if self.log.isEnabledFor(_INFO):
+            self.log.info('%s: %s, Button: %s(%s), action: %s', self._type, name, bn, self._button_name, state)
         if msg is None:
-            msg = self.current_state
-        elif self.current_state != msg:
-            self.current_state = msg
-        self.log.info('{}: {}, Button: {}({}), action: {}'.format(self.type, self.name, self.button_number, self.button_name, str(self)))
-        self.publish('{}/{}'.format(self.name, self.button_number), str(self))
-        self.timing()
+            self.publish(self._topic_btn, state)   #publish current value
+            return
+        if self._events.full():     #drop the oldest event, so the latest state is always queued
+            dropped = self._events.get_nowait()
+            self.log.warning('%s: %s, Button: %s(%s), event queue full, dropping: %s', self._type, name, bn, self._button_name, dropped)
+        self._events.put_nowait(msg)
         
     def __bool__(self):
         return self.current_state == 'Press'
             
     @property
     def button_groups(self):
-        return self.device['button_groups']
+        return self._button_groups
         
     @property
     def button_number(self):
-        return self.device['button_number']
+        return self._button_number
          
     @property
     def button_name(self):
-        return self.picobuttons[self.type].get(self.button_number, str(self.button_number))
+        return self._button_name
+        
+    @property
+    def button_name_upper(self):
+        return self._button_name_upper
         
     @property
     def current_state(self):
@@ -200,51 +247,100 @@ class PicoButton(Device):
         '''
         if button_name is None:
             return False
-        if isinstance(button_name, int):
+        if isinstance(button_name, int):    #includes bool from literal_eval
             return button_name
-        if button_name.isdigit():
-            return int(button_name) 
-        return self.button_number if self.button_name.upper() == button_name.upper() else None
+        if button_name.__class__ is str:
+            if button_name.isdigit():
+                return int(button_name)
+            return self._button_number if self._button_name_upper == button_name.upper() else None
+        return None
         
     def match(self, button_number):
         '''
         return True if button_number (name or number) matches this button
         '''
-        return self.button_number == self.button_number_from_name(button_number)
+        return self._button_number == self.button_number_from_name(button_number)
             
-    def timing(self):
+    def _publish_button(self, state):
         '''
-        generate double click and long press events
+        publish button state, unless short press only is selected
         '''
-        if bool(self):  #Press
-            if self.loop.time() - self.start <= self.double_click_time:
-                self.publish('{}/{}/double'.format(self.name, self.button_number), str(self))
-            self.start = self.loop.time()
-        self._long_press_task = self.long_press()
+        if not self.suppress:
+            self.publish(self._topic_btn, state)
             
-    def long_press(self):
+    async def _event_loop(self):
         '''
-        longpress timing
-        returns asyncio.TimerHandle() or None
-        
-        if button is pressed, start callback in self.long_press_time seconds, return timer
-        if button is released, and timer has not been cancelled, cancel timer. return None
-        if time expires, publish button setting, cancel timer (canceled timer still exists)
-        if button is released after timer expires (and has been cancelled, but is not None),
-           publish current button setting, cancel timer and return None
+        button state machine, one long lived task per button
+        reads Press/Release events queued by __call__ and generates double click and long press events
+        
+        press:   publish button ON, publish double ON if within self.double_click_time of the last press
+                 then wait up to self.long_press_time for the next event
+        timeout: publish long ON, wait for the next event, publish button OFF, long OFF
+        release: publish button OFF
+        a Press while the button is held (lost Release) ends the held press as above, then starts a new press
+        
+        if self.suppress is set, the button ON/OFF topics are not published, instead a single short ON
+        is published on release, unless a double click or long press was published for this press.
+        the short event is deferred until self.double_click_time after the press, if the button is pressed
+        again in that time, it is a double click and no short event is published
         '''
-        if bool(self):
-            if not self._long_press_task:
-                return self.loop.call_later(self.long_press_time, self.long_press)
-        else:
-            if self._long_press_task is None:
-                return None
-            if not self._long_press_task.cancelled():
-                return self._long_press_task.cancel()   #returns None
-        self.publish('{}/{}/long'.format(self.name, self.button_number), str(self))
-        return self._long_press_task.cancel()           #returns None
+        state = None
+        second_press = False
+        try:
+            while True:
+                if state is None:
+                    state = await self._events.get()
+                if state != 'Press':
+                    self._publish_button('OFF')
+                    state = None
+                    continue
+                self._publish_button('ON')
+                now = self.loop.time()
+                double = second_press or now - self.start <= self.double_click_time
+                second_press = False
+                self.start = now
+                if double:
+                    self.publish(self._topic_double, 'ON')
+                try:
+                    state = await asyncio.wait_for(self._events.get(), self.long_press_time)
+                except asyncio.TimeoutError:
+                    self.publish(self._topic_long, 'ON')
+                    state = await self._events.get()
+                    #any event ends the long press (a Press means the Release was lost)
+                    self._publish_button('OFF')
+                    self.publish(self._topic_long, 'OFF')
+                    if state != 'Press':
+                        state = None
+                    continue
+                self._publish_button('OFF')     #a Press here means the Release was lost
+                if state != 'Press':
+                    state = None
+                    if self.suppress and not double:
+                        remaining = self.start + self.double_click_time - self.loop.time()
+                        if remaining > 0:
+                            try:
+                                state = await asyncio.wait_for(self._events.get(), remaining)
+                            except asyncio.TimeoutError:
+                                pass
+                        if state == 'Press':
+                            second_press = True     #handle as double click
+                        else:
+                            self.publish(self._topic_short, 'ON')
+        except asyncio.CancelledError:
+            pass
+            
+    def stop(self):
+        '''
+        cancel event task
+        '''
+        if self._event_task is not None:
+            self._event_task.cancel()
+            self._event_task = None
         
 
+_DOMAIN_CLASSES = {'light': LightDimmer, 'switch': LightSwitch, 'fan': Fan, 'cover': Blind}
+_TYPE_DOMAINS = {type: domain for domain in _DOMAIN_CLASSES.keys() for type in _LEAP_DEVICE_TYPES.get(domain, [])}
+
 class Caseta(MQTT):
     '''
     Represents a Lutron Caseta lighting System, with methods for status and issuing commands
@@ -255,18 +351,22 @@ class Caseta(MQTT):
     
     certs = {"keyfile":"caseta.key", "certfile":"caseta.crt", "ca_certs":"caseta-bridge.crt"}
 
-    def __init__(self, bridgeip=None, log=None, **kwargs):
+    def __init__(self, bridgeip=None, log=None, suppress=False, **kwargs):
         super().__init__(log=log, **kwargs)
         self.log = log if log is not None else logging.getLogger('Main.'+__class__.__name__)
-        self.log.info(f'{__class__.__name__} library v{__class__.__version__}')
+        self.log.info('%s library v%s', __class__.__name__, __class__.__version__)
         self.bridgeip = bridgeip
+        self.suppress = suppress
         self.bridge = None
         self.loop = asyncio.get_event_loop()
+        self._name_to_id = {}
+        self._pico_index = {}
         self.bridge_methods = {func:getattr(Smartbridge, func) for func in dir(Smartbridge) if callable(getattr(Smartbridge, func)) and (not func.startswith("_") and not func in self._method_dict.keys()) }
         self._method_dict.update(self.bridge_methods)
         
     def _setup(self):
-        if all([os.path.exists(f) for f in self.certs.values()]):
+        existing = set(os.listdir('.'))     #certs are saved in the current directory
+        if all(f in existing for f in self.certs.values()):
             self.bridge = Smartbridge.create_tls(self.bridgeip, **self.certs)
             return True
         return False
@@ -277,74 +377,73 @@ class Caseta(MQTT):
             self.log.info("Press the small black button on the back of the bridge.")
         try:
             data = await async_pair(self.bridgeip, _ready)
-            with open(self.certs["ca_certs"], "w") as cacert:
-                cacert.write(data["ca"])
-            with open(self.certs["certfile"], "w") as cert:
-                cert.write(data["cert"])
-            with open(self.certs["keyfile"], "w") as key:
-                key.write(data["key"])
-            self.log.info(f"Successfully paired with {data['version']}")
+            Path(self.certs["ca_certs"]).write_text(data["ca"])
+            Path(self.certs["certfile"]).write_text(data["cert"])
+            Path(self.certs["keyfile"]).write_text(data["key"])
+            self.log.info("Successfully paired with %s", data['version'])
             return True
         except Exception as e:
-            self.log.exception('Error pairing: {}'.format(e))
+            self.log.exception('Error pairing: %s', e)
         return False
         
-    async def _connect(self):
-        while not self._setup():
-            while not await self._pair():
-                self.log.info('Retry pairing...')
-                await asyncio.sleep(1)
+    def _start(self):
+        '''
+        connect to the bridge in a background task, cancelled by stop()
+        '''
+        self._tasks['_connect'] = self.loop.create_task(self._connect())
         
+    async def _connect(self):
         try:
+            while not self._setup():
+                while not await self._pair():
+                    self.log.info('Retry pairing...')
+                    await asyncio.sleep(1)
+        
             await self.bridge.connect()
-            self.log.info("Connected to bridge: {}".format(self.bridgeip))
+            self.log.info("Connected to bridge: %s", self.bridgeip)
             self._publish('status', 'Connected')
                 
             for id, scene in self.bridge.get_scenes().items():
-                self.log.info('Found Scene: {} , {}'.format(id, scene)) 
-            for device, setting in self.bridge.get_devices().items():
-                self.log.debug("Found Device: {} : settings: {}".format(device, setting))
-            for type in _LEAP_DEVICE_TYPES.keys():
-                self._subscribe(type)
+                self.log.info('Found Scene: %s , %s', id, scene)
+            self._subscribe()
 
         except Exception as e:
             self.log.exception(e)
             
-    def _subscribe(self, type):
-        if type == 'sensor':
-            for device in self.bridge.get_buttons().values():
-                self.log.info("Found {}: {}".format(type, device))
-                callback = PicoButton(device, self)
-                self.bridge.add_button_subscriber(callback.device_id, callback)
-                callback()     #publish current value
-            return
-        for device in self.bridge.get_devices_by_domain(type):
-            self.log.info("Found {}: {}".format(type, device))
-            if type == 'light':
-                callback = LightDimmer(device, self)
-            elif type == 'switch':
-                callback = LightSwitch(device, self)
-            elif type == 'fan':
-                callback = Fan(device, self)
-            elif type == 'cover':
-                callback = Blind(device, self)
-            else:
-                callback = Device(device, self)
+    def _subscribe(self):
+        '''
+        subscribe to all devices in one pass over get_devices(), then all buttons
+        '''
+        for device_id, device in self.bridge.get_devices().items():
+            self.log.debug("Found Device: %s : settings: %s", device_id, device)
+            domain = _TYPE_DOMAINS.get(device.get('type'))
+            if domain is None:
+                continue
+            self.log.info("Found %s: %s", domain, device)
+            callback = _DOMAIN_CLASSES[domain](device, self, loop=self.loop)
             self.bridge.add_subscriber(callback.device_id, callback)
+            self._name_to_id.setdefault(callback.name, callback.device_id)     #first device with this name wins
+            callback()     #publish current value
+        for device in self.bridge.get_buttons().values():
+            self.log.info("Found sensor: %s", device)
+            callback = PicoButton(device, self, loop=self.loop, suppress=self.suppress)
+            self.bridge.add_button_subscriber(callback.device_id, callback)
+            self._pico_index.setdefault(callback.name, []).append((callback, callback.device_id))
             callback()     #publish current value
             
     def _device_id_from_name(self, device_name, button_number=None):
         if device_name:
-            for device_id, device in self.bridge._button_subscribers.items():
-                if device_name == device.name and device.match(button_number):
-                    self.log.info("Found Button: {} : settings: {}".format(device_id, device.device))
+            for device, device_id in self._pico_index.get(device_name, ()):
+                if device.match(button_number):
+                    self.log.info("Found Button: %s : settings: %s", device_id, device.device)
                     return device_id, True
-            for device_id, device in self.bridge._subscribers.items():
-                if device_name == device.name:
-                    self.log.info("Found Device: {} : settings: {}".format(device_id, device.device))
-                    return device_id, False
+            device_id = self._name_to_id.get(device_name)
+            if device_id is not None:
+                device = self.bridge._subscribers[device_id]
+                self.log.info("Found Device: %s : settings: %s", device_id, device.device)
+                return device_id, False
 
-            self.log.warning('Device: {} NOT FOUND'.format(device_name))
+            self.log.warning('Device: %s NOT FOUND', device_name)
         return None, False
         
     def _device_name(self, device_id):
@@ -357,12 +456,12 @@ class Caseta(MQTT):
         '''
         Override set_value in Smartbridge to parse args
         '''
-        if isinstance(value, tuple):
-            fade_time = int(value[1])
-            value = value[0]
-        if isinstance(value, str):
-            value = 0 if value.upper() == 'OFF' else 100 if value.upper() == 'ON' else int(value)
-        self.log.info('Setting: {}, to: {}%, fade time: {} s'.format(self._device_name(device_id), value, fade_time))
+        if value.__class__ is tuple:
+            value, fade_time = value[0], int(value[1])
+        if value.__class__ is str:
+            state = value.upper()
+            value = 0 if state == 'OFF' else 100 if state == 'ON' else int(value)
+        self.log.info('Setting: %s, to: %s%%, fade time: %s s', self._device_name(device_id), value, fade_time)
         await self.bridge.set_value(device_id, value, timedelta(seconds=fade_time)) 
         
     async def _button_action(self, button_id, action):
@@ -400,13 +499,13 @@ class Caseta(MQTT):
         insert self.bridge if it's a bridge command
         '''
         command, args = super()._get_command(msg)
-        device_name = msg.topic.split('/')[-2]
-        device_name = msg.topic.split('/')[-1] if device_name == self._name else device_name
+        topic = msg.topic.rsplit('/', 2)
+        device_name = topic[-1] if topic[-2] == self._name else topic[-2]
         device_name = None if device_name == command else device_name
-        self.log.info('Received command: {}, device: {}, args: {}'.format(command, device_name, args))
+        self.log.info('Received command: %s, device: %s, args: %s', command, device_name, args)
         args = [args] if not isinstance(args, list) else args
         nparams = len(signature(self._method_dict[command]).parameters) if command else len(args)
-        br = self.bridge if command in self.bridge_methods.keys() else None
+        br = self.bridge if command in self.bridge_methods else None
         device_id, is_button = self._device_id_from_name(device_name, *args)
         args = [str(a) if command == 'activate_scene' else a for a in args if a is not None]   #make scene_id string
         if device_id:
@@ -417,7 +516,7 @@ class Caseta(MQTT):
         if br:
             args.insert(0, br)
         args = args[:nparams]  #truncate extra parameters
-        self.log.info('Sending command: command: {}, args: {}'.format(command, args))
+        self.log.info('Sending command: command: %s, args: %s', command, args)
         return command, args
         
     def stop(self):
@@ -431,13 +530,14 @@ class Caseta(MQTT):
         put shutdown routines here
         '''
         await super()._stop()
+        for buttons in self._pico_index.values():
+            for button, button_id in buttons:
+                button.stop()
+        self._name_to_id = {}
+        self._pico_index = {}
         if self.bridge is not None:
             await self.bridge.close()
         
-    def _publish(self, topic=None, message=None):
-        if message is not None:
-            super()._publish(topic, message)
-        
         
 def parse_args():
     
@@ -512,6 +612,11 @@ def parse_args():
         action='store_true',
         default = False,
         help='publish topics as json (vs individual topics) (default: %(default)s)')
+    parser.add_argument(
+        '-S', '--suppress',
+        action='store_true',
+        default = False,
+        help='pico buttons: publish <name>/<button>/short ON instead of <name>/<button> ON/OFF, only if no double click or long press (delayed by the double click time) (default: %(default)s)')
     parser.add_argument(
         '-D', '--debug',
         action='store_true',
@@ -567,15 +672,15 @@ if __name__ == "__main__":
     
     log.debug('Debug Mode')
 
-    log.info("{} Version: {}".format(sys.argv[0], __version__))
+    log.info("%s Version: %s", sys.argv[0], __version__)
 
-    log.info("Python Version: {}".format(sys.version.replace('\n','')))
+    log.info("Python Version: %s", sys.version.replace('\n',''))
     
     if arg.poll_interval:
         if not arg.poll_methods:
             arg.poll_interval = 0
         else:
-            log.info(f'Polling {arg.poll_methods} every {arg.poll_interval}s')
+            log.info('Polling %s every %ss', arg.poll_methods, arg.poll_interval)
 
     loop = asyncio.get_event_loop()
     loop.set_debug(arg.debug)
@@ -591,9 +696,10 @@ if __name__ == "__main__":
                         name="caseta",
                         poll=(arg.poll_interval, arg.poll_methods),
                         json_out=arg.json_out,
+                        suppress=arg.suppress,
                         #log=log
                         )
-            asyncio.gather(r._connect(), return_exceptions=True)
+            r._start()
             loop.run_forever()
         else:
             r = Caseta(arg.bridgeip, log=log)
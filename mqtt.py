@@ -2,6 +2,7 @@
 MQTT Client library
 8/4/2022 V 1.0.0 N Waterton - Initial Release
 26/5/2022 V 1.0.1 N Waterton - Bug fixes
+14/10/2026 V 1.0.2 Don't publish None messages
 '''
 import re
 from ast import literal_eval
@@ -10,7 +11,7 @@ import asyncio
 
 import paho.mqtt.client as mqtt
 
-__version__ = "1.0.1"
+__version__ = "1.0.2"
 
 class MQTT():
     '''
@@ -140,7 +141,7 @@ class MQTT():
         return pubtopic
             
     def _publish(self, topic=None, message=None):
-        if topic is None and message is None:
+        if message is None:
             self._log.debug(f'Not pubishing: {topic}: {message}')
             return
         try: